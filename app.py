@@ -1,7 +1,16 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import polars as pl
+import pyarrow as pa
+from pyarrow import csv as pacsv
 import plotly.express as px
-import re  # Module pour chercher les codes postaux
+import pydeck as pdk
+import h3
+import io
+import os
+import time
+import urllib.request
 
 # --- CONFIGURATION DE LA PAGE ---
 st.set_page_config(page_title="Dashboard IRVE", layout="wide")
@@ -10,161 +19,368 @@ st.set_page_config(page_title="Dashboard IRVE", layout="wide")
 if "clear_cache" not in st.session_state:
     st.session_state["clear_cache"] = False
 
+# Motifs des codes postaux, appliqués par le moteur regex de Polars
+# (code postal dans l'adresse, code commune à 5 chiffres)
+CP_MOTIF = r'\b(\d{5})\b'
+CODE_MOTIF = r'^\d{5}$'
+
+# Cache disque des données nettoyées (évite de retélécharger à chaque démarrage)
+# (nom versionné : à changer dès que les colonnes produites par telecharger_donnees évoluent)
+CACHE_PARQUET = "irve_cache_v2.parquet"
+CACHE_DUREE = 86400  # 24 h
+COLONNES_CACHE = {'Opérateur', 'Puissance (kW)', 'Longitude', 'Latitude', 'Adresse', 'Code_Postal', 'Département', 'p_bin', 'h3_6'}
+
+# Vue nationale : bornes regroupées en hexagones H3 plutôt qu'affichées une à une
+H3_RESOLUTION = 6
+FRANCE_CENTRE = (46.6, 2.5)
+
+# Paliers de puissance (kW) : chaque borne reçoit un numéro de palier (int8) pour sa couleur
+PALIERS_PUISSANCE = [7.4, 11, 22, 50, 150]
+PALETTE_PALIERS = np.array([
+    [209, 238, 234], [168, 219, 217], [121, 192, 199],
+    [79, 144, 166], [59, 115, 143], [42, 86, 116]
+], dtype='uint8')
+
+# Tableau de détail paginé
+LIGNES_PAR_PAGE = 500
+
+# Types Arrow de chaînes conservés tels quels lors du passage en pandas
+TYPES_CHAINE_ARROW = {'string', 'large_string', 'string_view'}
+
 # --- 1. FONCTION DE CHARGEMENT DES DONNÉES ---
-@st.cache_data
-def load_data():
+def telecharger_donnees():
     # URL stable
     url = "https://www.data.gouv.fr/api/1/datasets/r/2729b192-40ab-4454-904d-735084dca3a3"
+
+    # User-Agent pour éviter le blocage 403
+    requete = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'})
+    with urllib.request.urlopen(requete) as reponse:
+        brut = reponse.read()
+    
+    # Mapping des colonnes
+    cols_map = {
+        'nom_operateur': 'Opérateur',
+        'puissance_nominale': 'Puissance (kW)', 
+        'consolidated_longitude': 'Longitude', 
+        'consolidated_latitude': 'Latitude', 
+        'code_insee_commune': 'Code_Commune', 
+        'adresse_station': 'Adresse'
+    }
+
+    # Types finaux (le code commune reste du texte pour garder le 0 initial)
+    cols_types = {
+        'code_insee_commune': pl.String,
+        'nom_operateur': pl.String,
+        'adresse_station': pl.String,
+        'puissance_nominale': pl.Float32,
+        'consolidated_longitude': pl.Float32,
+        'consolidated_latitude': pl.Float32
+    }
+
+    # Chargement du fichier complet (tokenizer Arrow multithreadé) : seules les colonnes utiles
+    # sont converties, une colonne absente du fichier est créée entièrement nulle, un champ vide
+    # devient nul (comme avec pandas/Polars, pour que fill_null s'applique), les lignes mal formées sont ignorées
+    table = pacsv.read_csv(
+        io.BytesIO(brut),
+        read_options=pacsv.ReadOptions(use_threads=True),
+        parse_options=pacsv.ParseOptions(
+            delimiter=",",
+            newlines_in_values=True,  # adresses sur plusieurs lignes entre guillemets (comme pandas/Polars)
+            invalid_row_handler=lambda ligne: 'skip'
+        ),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=list(cols_map),
+            include_missing_columns=True,
+            strings_can_be_null=True,
+            column_types={c: pa.string() for c in cols_map}
+        )
+    )
+
+    # Lu en texte puis converti par Polars : une valeur invalide devient nulle au lieu de tout faire échouer
+    df = pl.from_arrow(table).with_columns(
+        pl.col(c).cast(t, strict=False) for c, t in cols_types.items()
+    )
     
+    # Renommage
+    df = df.rename(cols_map)
+    
+    # Nettoyage de base (coordonnées absentes ou hors des bornes géographiques écartées)
+    df = df.drop_nulls(['Longitude', 'Latitude']).filter(
+        pl.col('Latitude').is_between(-90, 90) & pl.col('Longitude').is_between(-180, 180)
+    ).with_columns(
+        pl.col('Opérateur').fill_null("Opérateur Inconnu"),
+        pl.col('Adresse').fill_null("")
+    )
+
+    # --- LOGIQUE INTELLIGENTE (vectorisée) ---
+    # 1. Cherche 5 chiffres dans l'adresse
+    code_postal = pl.col('Adresse').str.extract(CP_MOTIF, 1)
+
+    # 2. Sinon utilise Code_Commune (s'il fait bien 5 chiffres)
+    if 'Code_Commune' in df.columns:
+        code_commune = pl.when(pl.col('Code_Commune').str.contains(CODE_MOTIF)).then(pl.col('Code_Commune'))
+        code_postal = pl.coalesce(code_postal, code_commune)
+
+    # Calculs + nettoyage des lignes sans code postal (ni adresse, ni code commune exploitable)
+    df = (
+        df.with_columns(code_postal.alias('Code_Postal'))
+        .drop_nulls('Code_Postal')
+        .with_columns(pl.col('Code_Postal').str.slice(0, 2).alias('Département'))
+    )
+    
+    # --- SUPPRESSION DE LA COLONNE CODE COMMUNE ---
+    # Maintenant qu'on a fini les calculs, on supprime cette colonne pour ne pas polluer l'affichage
+    if 'Code_Commune' in df.columns:
+        df = df.drop('Code_Commune')
+
+    # --- TYPES COMPACTS ---
+    # Catégories pour les colonnes texte répétitives (filtres et value_counts plus rapides)
+    # float32 suffit pour la puissance et les coordonnées
+    df = df.with_columns(
+        pl.col('Opérateur', 'Département', 'Code_Postal').cast(pl.Categorical),
+        pl.col('Puissance (kW)', 'Longitude', 'Latitude').cast(pl.Float32)
+    )
+
+    # Palier de puissance (0 à 5) pour la couleur des points
+    paliers = np.digitize(df['Puissance (kW)'].to_numpy(), bins=PALIERS_PUISSANCE).astype('int8')
+    df = df.with_columns(pl.Series('p_bin', paliers, dtype=pl.Int8))
+
+    # --- AGRÉGATION CARTOGRAPHIQUE ---
+    # Cellule H3 (résolution 6, ~36 km²) de chaque borne, pour la vue nationale
+    # h3 n'a pas d'API vectorisée : on ne l'appelle qu'une fois par position distincte
+    # (une station regroupe souvent plusieurs points de charge aux mêmes coordonnées)
+    coords = np.column_stack([df['Latitude'].to_numpy(), df['Longitude'].to_numpy()])
+    positions, inverse = np.unique(coords, axis=0, return_inverse=True)
+    cellules = np.array([h3.latlng_to_cell(float(lat), float(lon), H3_RESOLUTION) for lat, lon in positions], dtype=object)
+    df = df.with_columns(pl.Series('h3_6', cellules[inverse.reshape(-1)], dtype=pl.String))
+
+    return df
+
+
+def cache_valide():
+    if not os.path.exists(CACHE_PARQUET) or time.time() - os.path.getmtime(CACHE_PARQUET) >= CACHE_DUREE:
+        return False
+    try:
+        return COLONNES_CACHE.issubset(pl.read_parquet_schema(CACHE_PARQUET))
+    except Exception:
+        # Fichier illisible : on le reconstruit
+        return False
+
+
+# Données partagées en lecture seule : cache_resource renvoie le même objet à chaque appel
+# (cache_data en désérialiserait une copie complète à chaque filtrage)
+@st.cache_resource
+def load_data():
     try:
-        # User-Agent pour éviter le blocage 403
-        storage_options = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'}
-        
-        # Chargement
-        df = pd.read_csv(url, sep=",", nrows=20000, storage_options=storage_options, on_bad_lines='skip')
-        
-        # Mapping des colonnes
-        cols_map = {
-            'nom_operateur': 'Opérateur',
-            'puissance_nominale': 'Puissance (kW)', 
-            'consolidated_longitude': 'Longitude', 
-            'consolidated_latitude': 'Latitude', 
-            'code_insee_commune': 'Code_Commune', 
-            'adresse_station': 'Adresse'
+        # Cache local encore frais et complet : on évite le téléchargement et le parsing du CSV
+        if cache_valide():
+            df = pl.read_parquet(CACHE_PARQUET)
+        else:
+            df = telecharger_donnees()
+            # Sauvegarde pour les prochains démarrages (fichier temporaire puis remplacement atomique :
+            # une écriture interrompue ne laisse jamais de cache corrompu)
+            df.write_parquet(CACHE_PARQUET + ".tmp", compression='zstd')
+            os.replace(CACHE_PARQUET + ".tmp", CACHE_PARQUET)
+
+        # Le reste du dashboard (plotly, streamlit) travaille en pandas
+        # Texte libre (Adresse, h3_6) laissé dans ses buffers Arrow, sans passer par des objets Python ;
+        # les catégories (dictionnaires Arrow) et les nombres gardent leur conversion habituelle
+        df = df.to_pandas(types_mapper=lambda t: pd.ArrowDtype(t) if str(t) in TYPES_CHAINE_ARROW else None)
+
+        # Tri par puissance croissante (l'index d'origine est conservé comme numéro de ligne) :
+        # le seuil de puissance devient une recherche dichotomique au lieu d'un parcours complet
+        ordre = np.argsort(df['Puissance (kW)'].to_numpy(), kind='stable')
+        df = df.iloc[ordre]
+
+        # Index des lignes par département : le filtre devient une simple lecture de dictionnaire
+        dep_index = {d: np.asarray(idx) for d, idx in df.groupby('Département', observed=True).indices.items()}
+
+        # Colonne chaude du filtre gardée à part en tableau 1D contigu (parcours sans saut mémoire)
+        return {
+            "df": df,
+            "dep_index": dep_index,
+            "power": np.ascontiguousarray(df['Puissance (kW)'].to_numpy(dtype='float32')),
+            # Valeurs des filtres calculées une fois (pas à chaque interaction)
+            "deps": sorted(dep_index),
+            "max_p": int(df['Puissance (kW)'].max())
         }
-        
-        # Sélection et renommage
-        cols_presentes = [c for c in cols_map.keys() if c in df.columns]
-        df = df[cols_presentes]
-        df = df.rename(columns=cols_map)
-        
-        # Nettoyage de base
-        if 'Longitude' in df.columns and 'Latitude' in df.columns:
-            df = df.dropna(subset=['Longitude', 'Latitude'])
-            
-        if 'Opérateur' in df.columns:
-            df['Opérateur'] = df['Opérateur'].fillna("Opérateur Inconnu")
-            
-        if 'Adresse' in df.columns:
-            df['Adresse'] = df['Adresse'].fillna("")
-
-        # --- LOGIQUE INTELLIGENTE ---
-        def trouver_code_postal(row):
-            # 1. Cherche 5 chiffres dans l'adresse
-            if 'Adresse' in row:
-                match = re.search(r'\b(\d{5})\b', str(row['Adresse']))
-                if match:
-                    return match.group(1)
-            
-            # 2. Sinon utilise Code_Commune
-            if 'Code_Commune' in row and pd.notna(row['Code_Commune']):
-                code = str(row['Code_Commune'])
-                if len(code) == 5 and code.isdigit():
-                    return code
-            return "Inconnu"
-
-        # Calculs
-        df['Code_Postal'] = df.apply(trouver_code_postal, axis=1)
-        df['Département'] = df['Code_Postal'].apply(lambda x: x[:2] if x != "Inconnu" else "Inconnu")
-        
-        # Nettoyage des lignes sans département
-        df = df[df['Département'] != "Inconnu"]
-        
-        # --- SUPPRESSION DE LA COLONNE CODE COMMUNE ---
-        # Maintenant qu'on a fini les calculs, on supprime cette colonne pour ne pas polluer l'affichage
-        if 'Code_Commune' in df.columns:
-            df = df.drop(columns=['Code_Commune'])
-        
-        return df
 
     except Exception as e:
         st.error(f"Erreur technique : {e}")
-        return pd.DataFrame()
+        return {"df": pd.DataFrame(), "dep_index": {}, "power": np.empty(0, dtype='float32'), "deps": [], "max_p": 0}
+
+# --- 1bis. CALCULS MIS EN CACHE (clé : département + puissance min) ---
+def filtrer(dep, min_p):
+    donnees = load_data()
+    puissance = donnees["power"]
+    # Données triées par puissance : les lignes retenues forment la tranche [debut, fin)
+    # (les puissances manquantes, triées en dernier, sont exclues)
+    debut = np.searchsorted(puissance, min_p, side='left')
+    fin = np.searchsorted(puissance, np.inf, side='right')
+    if dep == "Tous":
+        return donnees["df"].iloc[debut:fin]
+    # Positions du département (croissantes) : même recherche dichotomique sur la tranche
+    idx = donnees["dep_index"][dep]
+    idx = idx[np.searchsorted(idx, debut):np.searchsorted(idx, fin)]
+    return donnees["df"].iloc[idx]
+
+@st.cache_data
+def top10_operators(dep, min_p):
+    # Comptage unique des opérateurs (codes entiers de la catégorie) ; on retire les opérateurs
+    # absents du filtre, que value_counts liste avec 0 pour une catégorie
+    vc = filtrer(dep, min_p)['Opérateur'].value_counts()
+    vc = vc[vc > 0].head(10)
+    return pd.DataFrame({'Opérateur': vc.index.astype(str), 'Nombre': vc.to_numpy()})
+
+@st.cache_data
+def compute_kpis(dep, min_p):
+    df_filtered = filtrer(dep, min_p)
+    if df_filtered.empty:
+        return 0, 0, "-"
+    moy = round(float(df_filtered['Puissance (kW)'].mean()), 1)
+    # L'opérateur principal est la tête du top 10 (même comptage, déjà en cache)
+    top = top10_operators(dep, min_p)['Opérateur'].iloc[0]
+    return len(df_filtered), moy, top
+
+# Dégradé "Teal" (clair -> foncé) appliqué côté Python : le navigateur reçoit des entiers RGB
+COULEUR_BASSE = np.array([209, 238, 234])
+COULEUR_HAUTE = np.array([42, 86, 116])
+
+def degrade(valeurs):
+    t = valeurs / max(float(valeurs.max()), 1.0)
+    return (COULEUR_BASSE + t[:, None] * (COULEUR_HAUTE - COULEUR_BASSE)).astype('uint8').tolist()
+
+@st.cache_data
+def build_map_data(dep, min_p):
+    df_filtered = filtrer(dep, min_p)
+    # Données minimales pour la carte : position (5 décimales ~ 1 m), couleur et infobulle
+    # (arrondi en float64 : un float32 arrondi redevient 7.400000095367432 une fois converti en JSON)
+    points = pd.DataFrame({
+        'lon': df_filtered['Longitude'].to_numpy(dtype='float64').round(5),
+        'lat': df_filtered['Latitude'].to_numpy(dtype='float64').round(5),
+        'color': PALETTE_PALIERS[df_filtered['p_bin'].to_numpy()].tolist(),
+        'operateur': df_filtered['Opérateur'].astype(str).to_numpy(),
+        'puissance': df_filtered['Puissance (kW)'].to_numpy(dtype='float64').round(1),
+        'adresse': df_filtered['Adresse'].astype(str).to_numpy()
+    })
+    centre = (float(points['lat'].mean()), float(points['lon'].mean()))
+    return points.to_dict('records'), centre
+
+@st.cache_data
+def build_hex_data(min_p):
+    # Nombre de bornes par hexagone H3 (quelques centaines de cellules au lieu de milliers de points)
+    comptes = filtrer("Tous", min_p)['h3_6'].value_counts()
+    hexagones = pd.DataFrame({
+        'hex': comptes.index.to_numpy(),
+        'nombre': comptes.to_numpy(),
+        'color': degrade(comptes.to_numpy(dtype='float32'))
+    })
+    return hexagones.to_dict('records')
 
 # Chargement
 with st.spinner('Chargement et analyse des données...'):
-    df = load_data()
+    donnees = load_data()
+    df = donnees["df"]
+
+# --- 2. OPTIONS ---
+# Affichées avant l'arrêt sur données vides : le rechargement reste possible après une erreur
+st.sidebar.header("⚙️ Options")
+
+if st.sidebar.button("🔄 Recharger les données (Vider Cache)"):
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    if os.path.exists(CACHE_PARQUET):
+        os.remove(CACHE_PARQUET)
+    st.rerun()
 
 if df.empty:
     st.warning("Aucune donnée chargée.")
     st.stop()
 
-# --- 2. INTERFACE DASHBOARD ---
+# --- 3. INTERFACE DASHBOARD ---
 
 st.title("⚡ Tableau de Bord : Bornes Électriques France")
 st.markdown("Explorez les infrastructures de recharge (Données Data.gouv.fr)")
 st.divider()
 
-# --- 3. FILTRES ---
-st.sidebar.header("🔍 Filtres & Options")
+# --- 3bis. DASHBOARD (fragment : un changement de filtre ne relance que cette partie) ---
+@st.fragment
+def render_dashboard(liste_dep, max_p):
+    # Les fragments ne peuvent pas écrire dans la sidebar : les filtres sont en haut du dashboard
+    f1, f2 = st.columns(2)
+    choix_dep = f1.selectbox("Département :", ["Tous"] + liste_dep)
+    min_power = f2.slider("Puissance Min (kW)", 0, max_p, 0)
 
-if st.sidebar.button("🔄 Recharger les données (Vider Cache)"):
-    st.cache_data.clear()
-    st.rerun()
+    # --- 4. KPIs ---
+    nb_bornes, moy, top = compute_kpis(choix_dep, min_power)
+    k1, k2, k3 = st.columns(3)
+    k1.metric("Bornes", nb_bornes)
+    k2.metric("Puissance Moyenne", f"{moy} kW")
+    k3.metric("Opérateur Principal", top)
 
-if 'Département' in df.columns:
-    liste_dep = sorted(df['Département'].unique())
-    choix_dep = st.sidebar.selectbox("Département :", ["Tous"] + liste_dep)
-else:
-    choix_dep = "Tous"
+    st.divider()
 
-max_p = int(df['Puissance (kW)'].max()) if 'Puissance (kW)' in df.columns else 250
-min_power = st.sidebar.slider("Puissance Min (kW)", 0, max_p, 0)
+    # --- 5. GRAPHIQUES ---
+    col_map, col_stats = st.columns([2, 1])
 
-# Application Filtres
-df_filtered = df.copy()
+    with col_map:
+        st.subheader("📍 Carte Interactive")
+        if nb_bornes:
+            if choix_dep == "Tous":
+                # Vue nationale : hexagones agrégés
+                couche = pdk.Layer(
+                    "H3HexagonLayer",
+                    data=build_hex_data(min_power),
+                    get_hexagon='hex',
+                    get_fill_color='color',
+                    extruded=False,
+                    pickable=True
+                )
+                vue = pdk.ViewState(latitude=FRANCE_CENTRE[0], longitude=FRANCE_CENTRE[1], zoom=5)
+                infobulle = {"text": "{nombre} bornes"}
+            else:
+                points, (lat_c, lon_c) = build_map_data(choix_dep, min_power)
+                # Rendu WebGL (deck.gl) : un seul appel de dessin pour tous les points
+                couche = pdk.Layer(
+                    "ScatterplotLayer",
+                    data=points,
+                    get_position=['lon', 'lat'],
+                    get_fill_color='color',
+                    get_radius=50,
+                    radius_min_pixels=3,
+                    pickable=True
+                )
+                vue = pdk.ViewState(latitude=lat_c, longitude=lon_c, zoom=8)
+                # Texte brut : l'opérateur et l'adresse viennent du CSV et ne doivent pas être interprétés en HTML
+                infobulle = {"text": "{operateur}\n{puissance} kW\n{adresse}"}
+                st.caption("Couleur : paliers < 7,4 / 11 / 22 / 50 / 150 kW / au-delà (du plus clair au plus foncé)")
+            st.pydeck_chart(pdk.Deck(layers=[couche], initial_view_state=vue, map_provider="carto", map_style="road", tooltip=infobulle))
+        else:
+            st.info("Aucune donnée.")
 
-if choix_dep != "Tous":
-    df_filtered = df_filtered[df_filtered['Département'] == choix_dep]
+    with col_stats:
+        st.subheader("🏆 Top Opérateurs")
+        if nb_bornes:
+            fig_bar = px.bar(top10_operators(choix_dep, min_power), x='Nombre', y='Opérateur', orientation='h', text_auto=True)
+            fig_bar.update_layout(yaxis={'categoryorder':'total ascending'})
+            st.plotly_chart(fig_bar, use_container_width=True)
 
-if 'Puissance (kW)' in df_filtered.columns:
-    df_filtered = df_filtered[df_filtered['Puissance (kW)'] >= min_power]
+    # --- 6. TABLEAU DE DONNÉES ---
+    # Tableau construit et envoyé au navigateur seulement s'il est affiché, page par page
+    if st.toggle("📂 Voir le tableau de données", key="afficher_tableau"):
+        df_filtered = filtrer(choix_dep, min_power)
+        # On définit l'ordre d'affichage (Code_Postal est inclus, mais plus Code_Commune)
+        cols_ordre = ['Opérateur', 'Puissance (kW)', 'Code_Postal', 'Département', 'Adresse', 'Longitude', 'Latitude']
+        cols_finales = [c for c in cols_ordre if c in df_filtered.columns]
 
-# --- 4. KPIs ---
-k1, k2, k3 = st.columns(3)
-k1.metric("Bornes", len(df_filtered))
-moy = round(df_filtered['Puissance (kW)'].mean(), 1) if not df_filtered.empty else 0
-k2.metric("Puissance Moyenne", f"{moy} kW")
-top = df_filtered['Opérateur'].mode()[0] if not df_filtered.empty else "-"
-k3.metric("Opérateur Principal", top)
+        nb_pages = max(1, -(-len(df_filtered) // LIGNES_PAR_PAGE))
+        page = st.number_input("Page", min_value=1, max_value=nb_pages, value=1)
+        debut = (page - 1) * LIGNES_PAR_PAGE
 
-st.divider()
+        # Retour à l'ordre d'origine du fichier, seules les lignes de la page sont extraites
+        ordre = np.argsort(df_filtered.index.to_numpy(), kind='stable')[debut:debut + LIGNES_PAR_PAGE]
+        st.dataframe(df_filtered.iloc[ordre][cols_finales])
+        st.caption(f"Page {page} / {nb_pages} ({len(df_filtered)} bornes)")
 
-# --- 5. GRAPHIQUES ---
-col_map, col_stats = st.columns([2, 1])
-
-with col_map:
-    st.subheader("📍 Carte Interactive")
-    if not df_filtered.empty:
-        fig_map = px.scatter_mapbox(
-            df_filtered, 
-            lat="Latitude", lon="Longitude", 
-            color="Puissance (kW)",
-            # On affiche bien le Code Postal ici
-            hover_name="Opérateur",
-            hover_data={"Adresse": True, "Code_Postal": True, "Latitude": False, "Longitude": False},
-            zoom=8 if choix_dep != "Tous" else 5,
-            mapbox_style="open-street-map",
-            color_continuous_scale="Teal",
-            height=500
-        )
-        st.plotly_chart(fig_map, use_container_width=True)
-    else:
-        st.info("Aucune donnée.")
-
-with col_stats:
-    st.subheader("🏆 Top Opérateurs")
-    if not df_filtered.empty:
-        top_data = df_filtered['Opérateur'].value_counts().head(10).reset_index()
-        top_data.columns = ['Opérateur', 'Nombre']
-        fig_bar = px.bar(top_data, x='Nombre', y='Opérateur', orientation='h', text_auto=True)
-        fig_bar.update_layout(yaxis={'categoryorder':'total ascending'})
-        st.plotly_chart(fig_bar, use_container_width=True)
-
-# --- 6. TABLEAU DE DONNÉES ---
-with st.expander("📂 Voir le tableau de données"):
-    # On définit l'ordre d'affichage (Code_Postal est inclus, mais plus Code_Commune)
-    cols_ordre = ['Opérateur', 'Puissance (kW)', 'Code_Postal', 'Département', 'Adresse', 'Longitude', 'Latitude']
-    cols_finales = [c for c in cols_ordre if c in df_filtered.columns]
-    
-    st.dataframe(df_filtered[cols_finales])
\ No newline at end of file
+
+render_dashboard(donnees["deps"], donnees["max_p"])